@@ -1,10 +1,35 @@
 import subprocess
 import os
 
+def is_streamable_h264(input_video):
+    """
+    Checks whether the first video stream is already H.264 with yuv420p pixels,
+    in which case only the container needs rewriting.
+
+    Args:
+        input_video (str): Path to the input video.
+
+    Returns:
+        bool: True if the stream can be copied as-is, False otherwise (or if ffprobe is unavailable).
+    """
+    try:
+        result = subprocess.run([
+            'ffprobe',
+            '-v', 'error',
+            '-select_streams', 'v:0',
+            '-show_entries', 'stream=codec_name,pix_fmt',
+            '-of', 'csv=p=0',
+            input_video
+        ], check=True, capture_output=True, text=True)
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return False
+    return result.stdout.strip() == 'h264,yuv420p'
+
 def fix_video_for_streaming(input_video, output_video=None):
     """
     Fixes the input MP4 video for web streaming by transcoding to H.264,
     setting the pixel format to yuv420p, and moving the moov atom to the start.
+    Inputs that are already H.264/yuv420p are remuxed without re-encoding.
 
     Args:
         input_video (str): Path to the input MP4 video.
@@ -18,13 +43,23 @@ def fix_video_for_streaming(input_video, output_video=None):
         base, ext = os.path.splitext(input_video)
         output_video = f"{base}_fixed{ext}"
 
+    if is_streamable_h264(input_video):
+        # Already web-compatible: rewrite the container only, no re-encode
+        codec_args = ['-c', 'copy']
+    else:
+        codec_args = [
+            '-c:v', 'libx264',          # Transcode to H.264
+            '-preset', 'faster',        # Much faster than the default 'medium', near-identical quality
+            '-threads', '0',            # Let x264 use all cores
+            '-pix_fmt', 'yuv420p',      # Set pixel format for compatibility
+        ]
+
     try:
         subprocess.run([
             'ffmpeg',
             '-i', input_video,          # Input video
-            '-c:v', 'libx264',          # Transcode to H.264
-            '-pix_fmt', 'yuv420p',      # Set pixel format for compatibility
-            '-movflags', 'faststart',   # Move moov atom to start
+            *codec_args,
+            '-movflags', '+faststart',  # Move moov atom to start
             output_video                # Output video
         ], check=True)
         print(f"Fixed video saved as '{output_video}'")
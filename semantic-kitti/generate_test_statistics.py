@@ -1,7 +1,8 @@
 import numpy as np
 import os
-import json
+import orjson
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 # SemanticKITTI label mapping
 label_to_name = {
@@ -12,6 +13,14 @@ label_to_name = {
     255: "moving-motorcyclist", 256: "moving-on-rails", 257: "moving-bus", 258: "moving-truck", 259: "moving-other-vehicle"
 }
 
+# compact class columns: SemanticKITTI id → 0..C-1, -1 for ids outside the mapping
+CLASS_IDS   = np.array(sorted(label_to_name))
+CLASS_NAMES = [label_to_name[k] for k in CLASS_IDS]
+COMPACT_ID  = np.full(0x10000, -1, dtype=np.int8)
+COMPACT_ID[CLASS_IDS] = np.arange(len(CLASS_IDS))
+
+JSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2   # C serializer, NumPy-aware
+
 # ------------------------------------------------------------------------------------
 # I/O HELPERS
 # ------------------------------------------------------------------------------------
@@ -21,55 +30,76 @@ def load_calib(calib_path):
         calib = {}
         for line in f:
             key, value = line.split(':', 1)
-            calib[key.strip()] = np.array([float(x) for x in value.split()])
+            key = key.strip()
+            if key in ('Tr', 'P2'):                   # only matrices we use
+                calib[key] = np.array(value.split(), dtype=np.float64)
     Tr = calib['Tr'].reshape(3, 4)
     Tr = np.vstack([Tr, [0, 0, 0, 1]])                # 4×4 homogeneous
     P2 = calib['P2'].reshape(3, 4)
     return Tr, P2
 
 def load_poses(pose_path):
-    """Load poses from poses.txt."""
-    poses = []
-    with open(pose_path, 'r') as f:
-        for line in f:
-            pose = np.array([float(x) for x in line.split()]).reshape(3, 4)
-            pose = np.vstack([pose, [0, 0, 0, 1]])
-            poses.append(pose)
+    """Load poses from poses.txt as an (F, 4, 4) array."""
+    poses_flat = np.loadtxt(pose_path, dtype=np.float64, ndmin=2)
+    poses = np.zeros((len(poses_flat), 4, 4))
+    poses[:, :3, :] = poses_flat.reshape(-1, 3, 4)
+    poses[:, 3, 3] = 1
     return poses
 
 def load_times(times_path):
     """Load timestamps from times.txt."""
-    with open(times_path, 'r') as f:
-        return [float(line.strip()) for line in f]
+    return np.loadtxt(times_path, dtype=np.float64, ndmin=1)
+
+def map_binary(path, dtype):
+    """Memory-map a flat binary file; empty files (which cannot be mapped) give an empty array."""
+    if os.path.getsize(path) == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r')
 
 def load_frame_data(frame_id, velodyne_dir, label_dir):
     """Load point cloud and 16-bit semantic labels for a frame."""
-    # point cloud (x,y,z,i) → keep xyz
+    # point cloud (x,y,z,i) → keep xyz; memory-mapped, no per-frame read buffer
     points = (
-        np.fromfile(os.path.join(velodyne_dir, f"{frame_id}.bin"), dtype=np.float32)
+        map_binary(os.path.join(velodyne_dir, f"{frame_id}.bin"), np.float32)
         .reshape(-1, 4)[:, :3]
     )
 
     # labels: 32-bit, lower 16 bits = semantic id, upper 16 bits = instance id
-    labels_raw = np.fromfile(os.path.join(label_dir, f"{frame_id}.label"), dtype=np.uint32)
+    labels_raw = map_binary(os.path.join(label_dir, f"{frame_id}.label"), np.uint32)
     labels = labels_raw & 0xFFFF  # extract 16-bit semantic id
 
     return points, labels
 
+def prefetch_frame_data(frame_id, velodyne_dir, label_dir):
+    """Hint the kernel to read a frame's files ahead of use (no-op without posix_fadvise)."""
+    if not hasattr(os, "posix_fadvise"):
+        return
+    for path in (os.path.join(velodyne_dir, f"{frame_id}.bin"),
+                 os.path.join(label_dir, f"{frame_id}.label")):
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue                       # past the last frame
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        finally:
+            os.close(fd)
+
 # ------------------------------------------------------------------------------------
 # GEOMETRY
 # ------------------------------------------------------------------------------------
-def project_to_front_view(points, labels, Tr, P2):
-    """Project points to front view and filter for windshield perspective."""
-    points_hom = np.hstack([points, np.ones((points.shape[0], 1))])
-    points_cam = (Tr @ points_hom.T).T
+def project_to_front_view(points, labels, M, Tr_z):
+    """Project points to front view and filter for windshield perspective.
 
-    mask_z = points_cam[:, 2] > 0          # keep points in front of camera
-    points_cam   = points_cam[mask_z]
+    M is the fused 3×4 projection P2 @ Tr, Tr_z the 1×4 camera-depth row of Tr.
+    """
+    z_cam = points @ Tr_z[0, :3] + Tr_z[0, 3]
+
+    mask_z = z_cam > 0                     # keep points in front of camera
     labels       = labels[mask_z]
     points_world = points[mask_z]          # original xyz after z-filter
 
-    proj = (P2 @ np.hstack([points_cam[:, :3], np.ones((points_cam.shape[0], 1))]).T).T
+    proj = points_world @ M[:, :3].T + M[:, 3]
     proj   = proj[:, :2] / proj[:, 2:]
 
     mask_img = (
@@ -79,10 +109,52 @@ def project_to_front_view(points, labels, Tr, P2):
 
     return points_world[mask_img], proj[mask_img], labels[mask_img]
 
+# ------------------------------------------------------------------------------------
+# PER-FRAME / EGO-MOTION
+# ------------------------------------------------------------------------------------
+def compute_ego_motion(poses, times):
+    """Per-frame speed, acceleration and yaw, plus total distance travelled."""
+    poses = np.asarray(poses, dtype=np.float64).reshape(-1, 4, 4)
+    times = np.asarray(times, dtype=np.float64)[:len(poses)]
+
+    disp   = np.linalg.norm(np.diff(poses[:, :3, 3], axis=0), axis=1)
+    dt     = np.diff(times)
+    ok     = dt > 0                        # zero speed / acc where dt ≤ 0
+    speeds = np.zeros(len(poses))
+    speeds[1:] = np.divide(disp, dt, out=np.zeros_like(disp), where=ok)
+    accs   = np.zeros(len(poses))
+    accs[1:]   = np.divide(np.diff(speeds), dt, out=np.zeros_like(disp), where=ok)
+    yaws   = np.degrees(np.arctan2(poses[:, 1, 0], poses[:, 0, 0]))
+
+    return speeds.tolist(), accs.tolist(), yaws.tolist(), float(disp.sum())
+
+def process_frame(fid_str, velodyne_dir, label_dir, M, Tr_z, prefetch_ahead=1):
+    """Class distribution of one frame's front-view points: compact row + {name: pct} of unmapped ids."""
+    # frames N..N+prefetch_ahead-1 are already in flight → read ahead the first one not yet started
+    prefetch_frame_data(f"{int(fid_str) + prefetch_ahead:06d}", velodyne_dir, label_dir)
+    pts, lbl = load_frame_data(fid_str, velodyne_dir, label_dir)
+    pts_f, _, lbl_f = project_to_front_view(pts, lbl, M, Tr_z)
+
+    cnts  = np.bincount(lbl_f.astype(np.int64), minlength=260)   # labels are small ints → no sort
+    uniq  = cnts.nonzero()[0]
+    total = len(lbl_f) if len(lbl_f) else 1
+    pct   = cnts[uniq] * (100.0 / total)
+    cols  = COMPACT_ID[uniq]
+    known = cols >= 0
+    row   = np.zeros(len(CLASS_IDS))
+    row[cols[known]] = pct[known]
+    return row, {f"unknown_{k}": float(v) for k, v in zip(uniq[~known], pct[~known])}
+
+def name_class_percentages(row, unknown):
+    """{class name: pct} for the non-zero columns of a compact row, plus unmapped classes."""
+    named = {CLASS_NAMES[c]: float(row[c]) for c in np.flatnonzero(row)}
+    named.update(unknown)
+    return named
+
 # ------------------------------------------------------------------------------------
 # MAIN SEQUENCE PROCESSOR
 # ------------------------------------------------------------------------------------
-def process_sequence(sequence_dir, output_dir):
+def process_sequence(sequence_dir, output_dir, frame_workers=1):
     scene        = os.path.basename(os.path.normpath(sequence_dir))
     calib_path   = f"./calibration/sequences/{scene}/calib.txt"
     times_path   = f"./calibration/sequences/{scene}/times.txt"
@@ -94,57 +166,60 @@ def process_sequence(sequence_dir, output_dir):
     poses   = load_poses(pose_path)
     times   = load_times(times_path)
 
-    frame_summaries         = []
-    class_percentages_list  = []
-    speeds                  = []
-    total_distance          = 0.0
-    prev_pose, prev_time    = None, None
-    prev_speed              = 0.0
-
-    for fid in range(len(poses)):
-        fid_str = f"{fid:06d}"
-        pts, lbl = load_frame_data(fid_str, velodyne_dir, label_dir)
-        pts_f, _, lbl_f = project_to_front_view(pts, lbl, Tr, P2)
-
-        # class distribution
-        uniq, cnts = np.unique(lbl_f, return_counts=True)
-        total = len(lbl_f) if len(lbl_f) else 1
-        pct   = {int(k): float(v) * 100 / total for k, v in zip(uniq, cnts)}
-        pct_named = {label_to_name.get(k, f"unknown_{k}"): v for k, v in pct.items()}
-
-        # ego-motion
-        pose  = poses[fid]
-        t_now = times[fid]
-        if prev_pose is None:
-            speed, acc = 0.0, 0.0
-        else:
-            disp      = np.linalg.norm(pose[:3, 3] - prev_pose[:3, 3])
-            dt        = t_now - prev_time
-            speed     = disp / dt if dt > 0 else 0.0
-            acc       = (speed - prev_speed) / dt if dt > 0 else 0.0
-            total_distance += disp
-        yaw = np.degrees(np.arctan2(pose[1, 0], pose[0, 0]))
-
-        frame_summaries.append({
-            "frame_id": fid_str,
-            "timestamp": t_now,
-            "class_percentages": pct_named,
-            "unique_classes": list(pct_named.keys()),
-            "ego_motion": {"speed": speed, "acceleration": acc, "direction": yaw}
-        })
-
-        class_percentages_list.append(pct_named)
-        speeds.append(speed)
-        prev_pose, prev_time, prev_speed = pose, t_now, speed
+    # fused velodyne → image projection and camera-depth row, float32 like the points
+    M       = (P2 @ Tr).astype(np.float32)
+    Tr_z    = Tr[2:3].astype(np.float32)
+
+    # ego-motion needs only poses/times → no serial dependency between frames
+    speeds, accs, yaws, total_distance = compute_ego_motion(poses, times)
+
+    # frame summaries are streamed into a temp file (no O(F) list) and moved into place at the end
+    os.makedirs(output_dir, exist_ok=True)
+    frames_path  = os.path.join(output_dir, "frame_summaries.json")
+    partial_path = frames_path + ".partial"
+
+    class_hist   = np.zeros((len(poses), len(CLASS_IDS)))   # per-frame pct, one column per class
+    unknown_list = []                                       # unmapped ids, normally empty
+
+    fid_strs = [f"{fid:06d}" for fid in range(len(poses))]
+    try:
+        with ThreadPoolExecutor(max_workers=frame_workers) as ex, open(partial_path, "wb") as f:   # NumPy releases the GIL
+            results = ex.map(lambda fid_str: process_frame(fid_str, velodyne_dir, label_dir, M, Tr_z, frame_workers),
+                             fid_strs)
+
+            f.write(b"[")
+            for fid, (row, unknown) in enumerate(results):
+                pct_named = name_class_percentages(row, unknown)
+                frame_summary = {
+                    "frame_id": fid_strs[fid],
+                    "timestamp": times[fid],
+                    "class_percentages": pct_named,
+                    "unique_classes": list(pct_named.keys()),
+                    "ego_motion": {"speed": speeds[fid], "acceleration": accs[fid], "direction": yaws[fid]}
+                }
+                f.write((b",\n" if fid else b"\n") + orjson.dumps(frame_summary, option=JSON_OPTIONS))
+
+                class_hist[fid] = row
+                unknown_list.append(unknown)
+            f.write(b"\n]\n")
+    except BaseException:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)        # failed run → no leftover .partial
+        raise
+    os.replace(partial_path, frames_path)
 
     duration = times[-1] - times[0] if len(times) > 1 else 0.0
     avg_speed = total_distance / duration if duration > 0 else 0.0
 
-    all_classes = set().union(*class_percentages_list)
-    avg_class_pct = {
-        cls: float(np.mean([cp.get(cls, 0.0) for cp in class_percentages_list]))
-        for cls in all_classes
-    }
+    n_frames = max(len(poses), 1)
+    avg_row  = class_hist.sum(axis=0) / n_frames        # absent classes count as 0 in the mean
+    unknown_sums = defaultdict(float)
+    for unknown in unknown_list:
+        for cls, v in unknown.items():
+            unknown_sums[cls] += v
+    avg_class_pct = {CLASS_NAMES[c]: float(avg_row[c]) for c in np.flatnonzero(class_hist.any(axis=0))}
+    avg_class_pct.update({cls: v / n_frames for cls, v in unknown_sums.items()})
+    all_classes = set(avg_class_pct)
 
     sequence_summary = {
         "total_frames": len(poses),
@@ -157,16 +232,13 @@ def process_sequence(sequence_dir, output_dir):
         "average_class_percentages": avg_class_pct,
         "total_unique_classes": list(all_classes),
         "time_series": [
-            {"timestamp": times[i], "class_percentages": class_percentages_list[i]}
+            {"timestamp": times[i], "class_percentages": name_class_percentages(class_hist[i], unknown_list[i])}
             for i in range(len(times))
         ]
     }
 
-    os.makedirs(output_dir, exist_ok=True)
-    with open(os.path.join(output_dir, "frame_summaries.json"), "w") as f:
-        json.dump(frame_summaries, f, indent=4)
-    with open(os.path.join(output_dir, "sequence_summary.json"), "w") as f:
-        json.dump(sequence_summary, f, indent=4)
+    with open(os.path.join(output_dir, "sequence_summary.json"), "wb") as f:
+        f.write(orjson.dumps(sequence_summary, option=JSON_OPTIONS))
 
     print(f"Finished {scene} → {output_dir}")
 
@@ -177,6 +249,7 @@ def process_all_sequences(dataset_root):
     stats_root = "stats"
     os.makedirs(stats_root, exist_ok=True)
 
+    jobs = {}
     for seq_id in range(11, 22):                 # sequences 11-21 inclusive
         seq_str      = f"{seq_id:02d}"
         seq_dir      = os.path.join(dataset_root, seq_str)
@@ -185,12 +258,22 @@ def process_all_sequences(dataset_root):
         if not os.path.exists(seq_dir):
             print(f"{seq_dir} missing → skipped")
             continue
+        jobs[seq_str] = (seq_dir, out_dir)
 
-        try:
+    # one worker per sequence — inputs and outputs are disjoint
+    cpus          = os.cpu_count() or 1
+    workers       = max(1, min(len(jobs), cpus))
+    frame_workers = max(1, cpus // workers)      # remaining cores → frame threads, no oversubscription
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        futures = {}
+        for seq_str, (seq_dir, out_dir) in jobs.items():
             print(f"Processing {seq_str} …")
-            process_sequence(seq_dir, out_dir)
-        except Exception as e:
-            print(f"Error {seq_str}: {e}")
+            futures[seq_str] = ex.submit(process_sequence, seq_dir, out_dir, frame_workers)
+        for seq_str, fut in futures.items():
+            try:
+                fut.result()
+            except Exception as e:
+                print(f"Error {seq_str}: {e}")
 
 if __name__ == "__main__":
     process_all_sequences("./dataset/sequences")
@@ -1,7 +1,9 @@
 import numpy as np
 import os
-import json
+import orjson
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from numba import njit
 
 # SemanticKITTI label mapping
 label_to_name = {
@@ -12,6 +14,15 @@ label_to_name = {
     255: "moving-motorcyclist", 256: "moving-on-rails", 257: "moving-bus", 258: "moving-truck", 259: "moving-other-vehicle"
 }
 
+# Compact class columns: SemanticKITTI id -> 0..len(CLASS_IDS)-1, -1 for ids outside the mapping
+CLASS_IDS = np.array(sorted(label_to_name))
+CLASS_NAMES = [label_to_name[label] for label in CLASS_IDS]
+COMPACT_ID = np.full(0x10000, -1, dtype=np.int8)
+COMPACT_ID[CLASS_IDS] = np.arange(len(CLASS_IDS))
+
+# orjson serializes NumPy scalars/arrays natively and in C
+JSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2
+
 def load_calib(calib_path):
     """Load calibration matrices from calib.txt."""
     try:
@@ -19,7 +30,9 @@ def load_calib(calib_path):
             calib = {}
             for line in f:
                 key, value = line.split(':', 1)
-                calib[key.strip()] = np.array([float(x) for x in value.split()])
+                key = key.strip()
+                if key in ('Tr', 'P2'):  # Only these two matrices are used
+                    calib[key] = np.array(value.split(), dtype=np.float64)
         Tr = calib['Tr'].reshape(3, 4)
         Tr = np.vstack([Tr, [0, 0, 0, 1]])  # Homogeneous transformation
         P2 = calib['P2'].reshape(3, 4)
@@ -28,14 +41,12 @@ def load_calib(calib_path):
         raise FileNotFoundError(f"Error loading calib file {calib_path}: {e}")
 
 def load_poses(pose_path):
-    """Load poses from poses.txt."""
+    """Load poses from poses.txt as an (F, 4, 4) array."""
     try:
-        poses = []
-        with open(pose_path, 'r') as f:
-            for line in f:
-                pose = np.array([float(x) for x in line.split()]).reshape(3, 4)
-                pose = np.vstack([pose, [0, 0, 0, 1]])
-                poses.append(pose)
+        poses_flat = np.loadtxt(pose_path, dtype=np.float64, ndmin=2)
+        poses = np.zeros((len(poses_flat), 4, 4))
+        poses[:, :3, :] = poses_flat.reshape(-1, 3, 4)
+        poses[:, 3, 3] = 1
         return poses
     except Exception as e:
         raise FileNotFoundError(f"Error loading poses file {pose_path}: {e}")
@@ -43,33 +54,52 @@ def load_poses(pose_path):
 def load_times(times_path):
     """Load timestamps from times.txt."""
     try:
-        with open(times_path, 'r') as f:
-            times = [float(line.strip()) for line in f]
-        return times
+        return np.loadtxt(times_path, dtype=np.float64, ndmin=1)
     except Exception as e:
         raise FileNotFoundError(f"Error loading times file {times_path}: {e}")
 
+def map_binary(path, dtype):
+    """Memory-map a flat binary file; empty files cannot be mapped and give an empty array instead."""
+    if os.path.getsize(path) == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r')
+
 def load_frame_data(frame_id, velodyne_dir, label_dir):
     """Load point cloud and labels for a frame."""
     try:
-        points = np.fromfile(os.path.join(velodyne_dir, f"{frame_id}.bin"), dtype=np.float32).reshape(-1, 4)[:, :3]
-        labels = np.fromfile(os.path.join(label_dir, f"{frame_id}.label"), dtype=np.uint32)
+        # Memory-mapped: pages are faulted in from the OS cache instead of copied into a fresh buffer
+        points = map_binary(os.path.join(velodyne_dir, f"{frame_id}.bin"), np.float32).reshape(-1, 4)[:, :3]
+        labels = map_binary(os.path.join(label_dir, f"{frame_id}.label"), np.uint32)
         return points, labels
     except Exception as e:
         raise FileNotFoundError(f"Error loading frame {frame_id} data: {e}")
 
-def project_to_front_view(points, labels, Tr, P2):
-    """Project points to front view and filter for windshield perspective. Return original 3D points in front view."""
-    # Transform to camera coordinates
-    points_hom = np.hstack([points, np.ones((points.shape[0], 1))])
-    points_cam = (Tr @ points_hom.T).T
-    mask_z = points_cam[:, 2] > 0  # Only points in front of the camera
+def prefetch_frame_data(frame_id, velodyne_dir, label_dir):
+    """Ask the OS to start reading a frame's files in the background (no-op where unsupported)."""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    for path in (os.path.join(velodyne_dir, f"{frame_id}.bin"), os.path.join(label_dir, f"{frame_id}.label")):
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue  # e.g. past the last frame
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        finally:
+            os.close(fd)
+
+def project_to_front_view(points, labels, M, Tr_z):
+    """Project points to front view and filter for windshield perspective. Return original 3D points in front view.
+
+    M is the fused 3x4 projection P2 @ Tr and Tr_z the 1x4 camera-depth row of Tr.
+    """
+    z_cam = points @ Tr_z[0, :3] + Tr_z[0, 3]
+    mask_z = z_cam > 0  # Only points in front of the camera
     points_after_z = points[mask_z]  # Original 3D points after z-filter
-    points_cam = points_cam[mask_z]
     labels_after_z = labels[mask_z]
 
-    # Project to image plane
-    points_img = (P2 @ np.hstack([points_cam[:, :3], np.ones((points_cam.shape[0], 1))]).T).T
+    # Project straight to the image plane
+    points_img = points_after_z @ M[:, :3].T + M[:, 3]
     points_img = points_img[:, :2] / points_img[:, 2:]
     mask_img = (points_img[:, 0] >= 0) & (points_img[:, 0] < 1242) & (points_img[:, 1] >= 0) & (points_img[:, 1] < 375)
     points_front = points_after_z[mask_img]  # Original 3D points in front view
@@ -77,24 +107,123 @@ def project_to_front_view(points, labels, Tr, P2):
     labels_front = labels_after_z[mask_img]
     return points_front, points_img, labels_front
 
-def get_spatial_location(x, y, img_width=1242, img_height=375):
-    """Map image coordinates to descriptive spatial locations (e.g., 'top-left')."""
-    if x < img_width / 3:
-        x_loc = "left"
-    elif x < 2 * img_width / 3:
-        x_loc = "center"
-    else:
-        x_loc = "right"
-    if y < img_height / 3:
-        y_loc = "top"
-    elif y < 2 * img_height / 3:
-        y_loc = "middle"
-    else:
-        y_loc = "bottom"
-    return f"{y_loc}-{x_loc}"
-
-def process_sequence(sequence_dir, output_dir):
-    """Process the sequence and generate JSON summaries."""
+X_LOCATIONS = np.array(["left", "center", "right"])
+Y_LOCATIONS = np.array(["top", "middle", "bottom"])
+
+def get_spatial_locations(xs, ys, img_width=1242, img_height=375):
+    """Map arrays of image coordinates to descriptive spatial locations (e.g., 'top-left')."""
+    x_bins = np.digitize(xs, [img_width / 3, 2 * img_width / 3])
+    y_bins = np.digitize(ys, [img_height / 3, 2 * img_height / 3])
+    return [f"{y_loc}-{x_loc}" for y_loc, x_loc in zip(Y_LOCATIONS[y_bins], X_LOCATIONS[x_bins])]
+
+@njit(cache=True, nogil=True)
+def summarize_instances(semantic_labels, instance_ids, points_img, points_front):
+    """Per-instance class id, mean image position and minimum distance, in a single pass.
+
+    Points are visited in instance order so every instance is a contiguous run; instance 0
+    (no instance) is skipped. Returns parallel arrays ordered by instance id.
+    """
+    order = np.argsort(instance_ids, kind='mergesort')
+    n = order.shape[0]
+    inst_ids = np.empty(n, dtype=np.int64)
+    inst_classes = np.empty(n, dtype=np.int64)
+    mean_x = np.empty(n, dtype=np.float64)
+    mean_y = np.empty(n, dtype=np.float64)
+    min_dist = np.empty(n, dtype=np.float64)
+    count = 0
+    i = 0
+    while i < n:
+        inst_id = instance_ids[order[i]]
+        sum_x = 0.0
+        sum_y = 0.0
+        min_d2 = np.inf
+        j = i
+        while j < n and instance_ids[order[j]] == inst_id:
+            k = order[j]
+            sum_x += points_img[k, 0]
+            sum_y += points_img[k, 1]
+            d2 = (points_front[k, 0] * points_front[k, 0] + points_front[k, 1] * points_front[k, 1]
+                  + points_front[k, 2] * points_front[k, 2])
+            if d2 < min_d2:
+                min_d2 = d2
+            j += 1
+        if inst_id != 0:
+            inst_ids[count] = inst_id
+            inst_classes[count] = semantic_labels[order[i]]  # Assume consistent semantic label per instance
+            mean_x[count] = sum_x / (j - i)
+            mean_y[count] = sum_y / (j - i)
+            min_dist[count] = np.sqrt(min_d2)
+            count += 1
+        i = j
+    return inst_ids[:count], inst_classes[:count], mean_x[:count], mean_y[:count], min_dist[:count]
+
+def compute_ego_motion(poses, times):
+    """Compute per-frame speed, acceleration and direction (yaw) plus the total distance travelled."""
+    poses = np.asarray(poses, dtype=np.float64).reshape(-1, 4, 4)
+    times = np.asarray(times, dtype=np.float64)[:len(poses)]
+
+    # Displacement and time step between consecutive frames; the first frame has zero speed
+    displacements = np.linalg.norm(np.diff(poses[:, :3, 3], axis=0), axis=1)
+    time_diffs = np.diff(times)
+    moving = time_diffs > 0
+    speeds = np.zeros(len(poses))
+    speeds[1:] = np.divide(displacements, time_diffs, out=np.zeros_like(displacements), where=moving)
+    accelerations = np.zeros(len(poses))
+    accelerations[1:] = np.divide(np.diff(speeds), time_diffs, out=np.zeros_like(displacements), where=moving)
+
+    # Direction (yaw)
+    directions = np.degrees(np.arctan2(poses[:, 1, 0], poses[:, 0, 0]))
+    return speeds.tolist(), accelerations.tolist(), directions.tolist(), float(displacements.sum())
+
+def process_frame(frame_id_str, velodyne_dir, label_dir, M, Tr_z, prefetch_ahead=1):
+    """Load and project a single frame; return its class percentage row, unmapped class percentages and instances.
+
+    prefetch_ahead is the number of frames in flight at once; the frame that many places ahead is the
+    first one no worker has started yet, so its files are read ahead while this frame is projected.
+    """
+    prefetch_frame_data(f"{int(frame_id_str) + prefetch_ahead:06d}", velodyne_dir, label_dir)
+    points, labels = load_frame_data(frame_id_str, velodyne_dir, label_dir)
+    points_front, points_img, front_labels = project_to_front_view(points, labels, M, Tr_z)
+
+    # Extract semantic and instance labels
+    semantic_labels = front_labels & 0xFFFF
+    instance_ids = front_labels >> 16
+
+    # Compute class percentages over the compact class columns; unmapped ids are kept by name
+    counts = np.bincount(semantic_labels.astype(np.int64), minlength=260)  # O(N) histogram, no sort
+    unique = counts.nonzero()[0]
+    total_points = len(semantic_labels) if len(semantic_labels) > 0 else 1  # Avoid division by zero
+    percentages = counts[unique] * (100.0 / total_points)
+    columns = COMPACT_ID[unique]
+    known = columns >= 0
+    class_row = np.zeros(len(CLASS_IDS))
+    class_row[columns[known]] = percentages[known]
+    unknown_percentages = {f"unknown_{label}": percent
+                           for label, percent in zip(unique[~known], percentages[~known])}
+
+    # Identify instances
+    instances = []
+    inst_ids, inst_classes, mean_xs, mean_ys, min_dists = summarize_instances(
+        semantic_labels, instance_ids, points_img, points_front)
+    spatial_locs = get_spatial_locations(mean_xs, mean_ys)
+    for inst_id, inst_semantic, spatial_loc, min_distance in zip(
+            inst_ids, inst_classes, spatial_locs, min_dists):
+        instances.append({
+            "class": label_to_name.get(int(inst_semantic), "unknown"),
+            "instance_id": int(inst_id),
+            "spatial_location": spatial_loc,
+            "distance": float(min_distance)  # Minimum distance from ego vehicle in meters
+        })
+    return class_row, unknown_percentages, instances
+
+def name_class_percentages(class_row, unknown_percentages):
+    """Turn a compact class percentage row (plus unmapped classes) into a {class name: percentage} dict."""
+    named = {CLASS_NAMES[column]: class_row[column] for column in np.flatnonzero(class_row)}
+    named.update(unknown_percentages)
+    return named
+
+def process_sequence(sequence_dir, output_dir, frame_workers=1):
+    """Process the sequence and generate JSON summaries, using frame_workers threads for the frames."""
     # Load calibration, poses, and times
     calib_path = os.path.join(sequence_dir, 'calib.txt')
     pose_path = os.path.join(sequence_dir, 'poses.txt')
@@ -106,108 +235,71 @@ def process_sequence(sequence_dir, output_dir):
     poses = load_poses(pose_path)
     times = load_times(times_path)
 
+    # Fuse velodyne->camera and camera->image into a single projection. Kept in float32 like the
+    # velodyne points so the per-frame matmul does not upcast to float64.
+    M = (P2 @ Tr).astype(np.float32)
+    Tr_z = Tr[2:3].astype(np.float32)
+
+    # Ego-vehicle motion only depends on poses and times, so it is computed up front
+    speeds, accelerations, directions, total_distance = compute_ego_motion(poses, times)
+
+    # Frame summaries are streamed to disk as they are assembled rather than held in memory; they are
+    # written to a temporary file first so a failed run never leaves a truncated frame_summaries.json
+    os.makedirs(output_dir, exist_ok=True)
+    frame_summaries_path = os.path.join(output_dir, 'frame_summaries.json')
+    partial_path = frame_summaries_path + '.partial'
+
     # Initialize accumulators
-    frame_summaries = []
-    total_distance = 0
-    speeds = []
-    class_percentages_list = []
+    class_hist = np.zeros((len(poses), len(CLASS_IDS)))  # Per-frame class percentages, one column per class
+    unknown_percentages_list = []
     object_counts_list = []
-    prev_pose = None
-    prev_time = None
-    prev_speed = 0
-
-    # Process each frame
-    for frame_id in range(len(poses)):
-        frame_id_str = f"{frame_id:06d}"
-        points, labels = load_frame_data(frame_id_str, velodyne_dir, label_dir)
-        points_front, points_img, front_labels = project_to_front_view(points, labels, Tr, P2)
-
-        # Extract semantic and instance labels
-        semantic_labels = front_labels & 0xFFFF
-        instance_ids = front_labels >> 16
-
-        # Compute class percentages
-        unique, counts = np.unique(semantic_labels, return_counts=True)
-        total_points = len(semantic_labels) if len(semantic_labels) > 0 else 1  # Avoid division by zero
-        class_percentages = {label: count / total_points * 100 for label, count in zip(unique, counts)}
-        class_percentages_named = {label_to_name.get(label, f"unknown_{label}"): percent 
-                                   for label, percent in class_percentages.items()}
-
-        # Unique classes
-        unique_classes = list(class_percentages_named.keys())
-
-        # Identify instances
-        instances = []
-        for inst_id in np.unique(instance_ids):
-            if inst_id == 0:  # No instance
-                continue
-            mask = instance_ids == inst_id
-            inst_semantic = semantic_labels[mask][0]  # Assume consistent semantic label per instance
-            class_name = label_to_name.get(inst_semantic, "unknown")
-            inst_points_img = points_img[mask]  # 2D points for spatial location
-            inst_points_3d = points_front[mask]  # 3D points for distance
-            if len(inst_points_img) > 0:
-                mean_x = np.mean(inst_points_img[:, 0])
-                mean_y = np.mean(inst_points_img[:, 1])
-                spatial_loc = get_spatial_location(mean_x, mean_y)
-                # Compute minimum distance from ego vehicle
-                distances = np.linalg.norm(inst_points_3d, axis=1)  # Euclidean norm for each point
-                min_distance = float(np.min(distances))  # Minimum distance to closest point
-                instances.append({
-                    "class": class_name,
-                    "instance_id": int(inst_id),
-                    "spatial_location": spatial_loc,
-                    "distance": min_distance  # Add distance in meters
-                })
-
-        # Object counts
-        num_cars = len([inst for inst in instances if inst["class"] in ["car", "moving-car"]])
-        num_persons = len([inst for inst in instances if inst["class"] in ["person", "moving-person"]])
-
-        # Ego-vehicle motion
-        current_pose = poses[frame_id]
-        current_time = times[frame_id]
-        if prev_pose is not None:
-            displacement = np.linalg.norm(current_pose[:3, 3] - prev_pose[:3, 3])
-            time_diff = current_time - prev_time
-            speed = displacement / time_diff if time_diff > 0 else 0
-            acceleration = (speed - prev_speed) / time_diff if time_diff > 0 else 0
-            total_distance += displacement
-        else:
-            speed = 0
-            acceleration = 0
-
-        # Direction (yaw)
-        R = current_pose[:3, :3]
-        yaw = np.arctan2(R[1, 0], R[0, 0])
-        direction = float(np.degrees(yaw))
-
-        # Frame summary
-        frame_summary = {
-            "frame_id": frame_id_str,
-            "timestamp": current_time,
-            "class_percentages": class_percentages_named,
-            "unique_classes": unique_classes,
-            "instances": instances,
-            "num_cars": num_cars,
-            "num_persons": num_persons,
-            "ego_motion": {
-                "speed": speed,
-                "acceleration": acceleration,
-                "direction": direction
-            }
-        }
-        frame_summaries.append(frame_summary)
-
-        # Collect sequence data
-        class_percentages_list.append(class_percentages_named)
-        object_counts_list.append({"timestamp": current_time, "car_count": num_cars, "person_count": num_persons})
-        speeds.append(speed)
-
-        # Update previous values
-        prev_pose = current_pose
-        prev_time = current_time
-        prev_speed = speed
+
+    # Frames are independent; NumPy and the Numba kernel release the GIL for the heavy work
+    frame_ids = [f"{frame_id:06d}" for frame_id in range(len(poses))]
+    try:
+        with ThreadPoolExecutor(max_workers=frame_workers) as executor, open(partial_path, 'wb') as frames_file:
+            frame_results = executor.map(
+                lambda frame_id_str: process_frame(frame_id_str, velodyne_dir, label_dir, M, Tr_z, frame_workers),
+                frame_ids)
+
+            # Assemble frame summaries in order
+            frames_file.write(b'[')
+            for frame_id, (class_row, unknown_percentages, instances) in enumerate(frame_results):
+                frame_id_str = frame_ids[frame_id]
+                current_time = times[frame_id]
+
+                # Object counts
+                num_cars = len([inst for inst in instances if inst["class"] in ["car", "moving-car"]])
+                num_persons = len([inst for inst in instances if inst["class"] in ["person", "moving-person"]])
+
+                # Frame summary
+                class_percentages_named = name_class_percentages(class_row, unknown_percentages)
+                frame_summary = {
+                    "frame_id": frame_id_str,
+                    "timestamp": current_time,
+                    "class_percentages": class_percentages_named,
+                    "unique_classes": list(class_percentages_named.keys()),
+                    "instances": instances,
+                    "num_cars": num_cars,
+                    "num_persons": num_persons,
+                    "ego_motion": {
+                        "speed": speeds[frame_id],
+                        "acceleration": accelerations[frame_id],
+                        "direction": directions[frame_id]
+                    }
+                }
+                frames_file.write((b',\n' if frame_id else b'\n') + orjson.dumps(frame_summary, option=JSON_OPTIONS))
+
+                # Collect sequence data
+                class_hist[frame_id] = class_row
+                unknown_percentages_list.append(unknown_percentages)
+                object_counts_list.append({"timestamp": current_time, "car_count": num_cars, "person_count": num_persons})
+            frames_file.write(b'\n]\n')
+    except BaseException:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)  # Leave the output directory as it was
+        raise
+    os.replace(partial_path, frame_summaries_path)
 
     # Sequence-level statistics
     total_frames = len(poses)
@@ -217,20 +309,22 @@ def process_sequence(sequence_dir, output_dir):
     max_speed = max(speeds) if speeds else 0
     avg_speed_frames = float(np.mean(speeds)) if speeds else 0
 
-    # Average class percentages
-    all_classes = set()
-    for cp in class_percentages_list:
-        all_classes.update(cp.keys())
-    average_class_percentages = {}
-    for cls in all_classes:
-        percentages = [cp.get(cls, 0) for cp in class_percentages_list]
-        average_class_percentages[cls] = float(np.mean(percentages))
+    # Average class percentages; classes absent from a frame contribute 0
+    average_row = class_hist.sum(axis=0) / max(total_frames, 1)
+    unknown_sums = defaultdict(float)
+    for unknown_percentages in unknown_percentages_list:
+        for cls, percent in unknown_percentages.items():
+            unknown_sums[cls] += percent
+    average_class_percentages = {CLASS_NAMES[column]: float(average_row[column])
+                                 for column in np.flatnonzero(class_hist.any(axis=0))}
+    average_class_percentages.update({cls: total / max(total_frames, 1) for cls, total in unknown_sums.items()})
+    all_classes = set(average_class_percentages)
 
     # Time series data
     time_series = [
         {
             "timestamp": times[i],
-            "class_percentages": class_percentages_list[i],
+            "class_percentages": name_class_percentages(class_hist[i], unknown_percentages_list[i]),
             "car_count": object_counts_list[i]["car_count"],
             "person_count": object_counts_list[i]["person_count"]
         } for i in range(len(times))
@@ -250,12 +344,9 @@ def process_sequence(sequence_dir, output_dir):
         "time_series": time_series
     }
 
-    # Save JSON files in the output directory
-    os.makedirs(output_dir, exist_ok=True)
-    with open(os.path.join(output_dir, 'frame_summaries.json'), 'w') as f:
-        json.dump(frame_summaries, f, indent=4)
-    with open(os.path.join(output_dir, 'sequence_summary.json'), 'w') as f:
-        json.dump(sequence_summary, f, indent=4)
+    # Save the sequence summary next to the frame summaries
+    with open(os.path.join(output_dir, 'sequence_summary.json'), 'wb') as f:
+        f.write(orjson.dumps(sequence_summary, option=JSON_OPTIONS))
 
     print(f"JSON files generated for {sequence_dir}: '{output_dir}/frame_summaries.json' and '{output_dir}/sequence_summary.json'")
 
@@ -264,6 +355,7 @@ def process_all_sequences(dataset_root):
     stats_root = "stats"
     os.makedirs(stats_root, exist_ok=True)
 
+    jobs = {}
     for seq_id in range(11):  # Sequences 00 to 10
         seq_str = f"{seq_id:02d}"
         sequence_dir = os.path.join(dataset_root, seq_str)
@@ -272,12 +364,23 @@ def process_all_sequences(dataset_root):
         if not os.path.exists(sequence_dir):
             print(f"Sequence directory {sequence_dir} does not exist. Skipping.")
             continue
-
-        try:
+        jobs[seq_str] = (sequence_dir, output_dir)
+
+    # Sequences are independent (disjoint inputs and outputs), so run one worker per sequence and
+    # split the remaining cores between each sequence's frame threads to avoid oversubscription
+    cpu_count = os.cpu_count() or 1
+    sequence_workers = max(1, min(len(jobs), cpu_count))
+    frame_workers = max(1, cpu_count // sequence_workers)
+    with ProcessPoolExecutor(max_workers=sequence_workers) as executor:
+        futures = {}
+        for seq_str, (sequence_dir, output_dir) in jobs.items():
             print(f"Processing sequence {seq_str}...")
-            process_sequence(sequence_dir, output_dir)
-        except Exception as e:
-            print(f"Error processing sequence {seq_str}: {e}")
+            futures[seq_str] = executor.submit(process_sequence, sequence_dir, output_dir, frame_workers)
+        for seq_str, future in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                print(f"Error processing sequence {seq_str}: {e}")
 
 if __name__ == "__main__":
     dataset_root = "./dataset/sequences"  # Adjust to your dataset path
@@ -2,7 +2,7 @@ import numpy as np
 import os
 import glob
 import open3d as o3d
-import matplotlib.pyplot as plt
+import cv2
 
 # Define SemanticKITTI color map for visualization
 SEMANTIC_KITTI_COLORMAP = {
@@ -43,36 +43,40 @@ SEMANTIC_KITTI_COLORMAP = {
     257: [255, 255, 0]     # Moving-truck
 }
 
+# Dense lookup table over label ids; ids outside the colormap stay black
+COLORMAP_LUT = np.zeros((260, 3), dtype=np.uint8)
+for label, color in SEMANTIC_KITTI_COLORMAP.items():
+    COLORMAP_LUT[label] = color
+
 def load_point_cloud(bin_path, label_path):
     """Load point cloud and apply actual labels as colors."""
     points = np.fromfile(bin_path, dtype=np.float32).reshape(-1, 4)[:, :3]
     labels = np.fromfile(label_path, dtype=np.uint32) & 0xFFFF
-    colors = np.array([SEMANTIC_KITTI_COLORMAP.get(label, [0, 0, 0]) for label in labels]) / 255.0
+    colors = COLORMAP_LUT[np.minimum(labels, 259)].astype(np.float64) / 255.0
     pcd = o3d.geometry.PointCloud()
     pcd.points = o3d.utility.Vector3dVector(points)
     pcd.colors = o3d.utility.Vector3dVector(colors)
     return pcd
 
-def project_to_image(pcd, calib_path, pose_path, frame_id):
+def load_calib(calib_path):
+    """Load the Tr (velodyne to camera) and P2 (camera to image) 3x4 matrices from calib.txt."""
+    with open(calib_path, 'r') as f:
+        calib = {}
+        for line in f:
+            key, value = line.split(':', 1)
+            key = key.strip()
+            if key in ('Tr', 'P2'):
+                calib[key] = np.array(value.split(), dtype=np.float64)
+    return calib['Tr'].reshape(3, 4), calib['P2'].reshape(3, 4)
+
+def project_to_image(pcd, Tr, P2, frame_id):
     """Project point cloud to 2D image plane using calibration data."""
     try:
-        with open(calib_path, 'r') as f:
-            calib = {}
-            for line in f:
-                key, value = line.split(':', 1)
-                calib[key.strip()] = np.array([float(x) for x in value.split()])
-        
-        # Load calibration matrices
-        Tr = calib['Tr'].reshape(3, 4)
-        Tr = np.vstack([Tr, [0, 0, 0, 1]])
-        P2 = calib['P2'].reshape(3, 4)
-        
         # Get points and colors
         points = np.asarray(pcd.points)
-        points_hom = np.hstack([points, np.ones((points.shape[0], 1))])
         
         # Transform to camera coordinates
-        points_cam = (Tr @ points_hom.T).T
+        points_cam = points @ Tr[:3, :3].T + Tr[:3, 3]
         
         # Filter points in front of the camera (z > 0)
         mask_z = points_cam[:, 2] > 0
@@ -80,7 +84,7 @@ def project_to_image(pcd, calib_path, pose_path, frame_id):
         colors = np.asarray(pcd.colors)[mask_z]
         
         # Project to image plane
-        points_img = (P2 @ np.hstack([points_cam[:, :3], np.ones((points_cam.shape[0], 1))]).T).T
+        points_img = points_cam @ P2[:, :3].T + P2[:, 3]
         points_img = points_img[:, :2] / points_img[:, 2:]
         
         # Filter points within image bounds
@@ -88,12 +92,16 @@ def project_to_image(pcd, calib_path, pose_path, frame_id):
                    (points_img[:, 1] >= 0) & (points_img[:, 1] < 375)
         points_img = points_img[mask_img]
         colors = colors[mask_img]
+        depths = points_cam[mask_img, 2]
         
-        # Create image
+        # Create image with a single scatter. Points are written far-to-near so that, where several
+        # land on the same pixel, the last (nearest) one wins.
+        order = np.argsort(-depths, kind='stable')
+        xs = points_img[order, 0].astype(np.int32)
+        ys = points_img[order, 1].astype(np.int32)
+        rgb = (colors[order] * 255).astype(np.uint8)
         img = np.zeros((375, 1242, 3), dtype=np.uint8)
-        for pt, color in zip(points_img, colors):
-            x, y = int(pt[0]), int(pt[1])
-            img[y, x] = (color * 255).astype(np.uint8)
+        img[ys, xs] = rgb
         
         return img
     except Exception as e:
@@ -109,9 +117,15 @@ def generate_projections_for_scenes():
         pcd_dir = f"./dataset/sequences/{scene}/velodyne/"
         pred_label_dir = f"./dataset/sequences/{scene}/labels/"
         calib_path = f"./calibration/sequences/{scene}/calib.txt"
-        pose_path = f"./dataset/sequences/{scene}/poses.txt"
         output_img_dir = f"./dataset/sequences/{scene}/projections/"
         
+        # Calibration is fixed for the scene, so parse it once rather than per frame
+        try:
+            Tr, P2 = load_calib(calib_path)
+        except Exception as e:
+            print(f"Error loading calibration for scene {scene}: {e}")
+            continue
+        
         # Create output directory for projections
         os.makedirs(output_img_dir, exist_ok=True)
         
@@ -128,12 +142,14 @@ def generate_projections_for_scenes():
             )
             
             # Generate 2D projection
-            img_projected = project_to_image(pcd, calib_path, pose_path, frame_id)
+            img_projected = project_to_image(pcd, Tr, P2, frame_id)
             
             if img_projected is not None:
                 # Save the projected image
                 output_img_path = os.path.join(output_img_dir, f"{scene}_{frame_id}_projection.png")
-                plt.imsave(output_img_path, img_projected)
+                # cv2 expects BGR; low PNG compression trades a little disk space for faster writes
+                cv2.imwrite(output_img_path, cv2.cvtColor(img_projected, cv2.COLOR_RGB2BGR),
+                            [cv2.IMWRITE_PNG_COMPRESSION, 1])
                 print(f"Saved projection: {output_img_path}")
             else:
                 print(f"Skipped saving projection for frame {frame_id} due to error.")